@@ -5,6 +5,218 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import plotly.express as px # For advanced global intel mapping
+import os
+import json
+import hashlib
+import numpy as np
+from atomic_dataset_registry import load_atomic_dataset # Snapshot-backed dataset sources
+
+# Local vault for precomputed intel artifacts, reused between runs
+ATOMIC_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'atomic_intel_cache')
+
+
+def atomic_frame_fingerprint(frame, columns):
+    """
+    Content fingerprint of the given columns of a frame: a SHA-1 over the
+    column names and pandas' per-row hashes. Any revised value, added or
+    dropped row changes it, so cached artifacts keyed on it never go stale.
+    """
+    row_hashes = pd.util.hash_pandas_object(frame[list(columns)], index=False).to_numpy()
+    return hashlib.sha1(json.dumps(list(columns)).encode('utf-8') + row_hashes.tobytes()).hexdigest()
+
+
+class AtomicLocationDateStore:
+    """
+    Dense location-by-date store: every location is aligned onto one daily
+    date grid, and each metric is a 2D float64 array (locations x days) kept
+    in a memory-mapped .npy file. Comparisons, rankings and rolling windows
+    become vectorized axis operations, and the store reopens instantly.
+    Days with no report are NaN.
+    """
+
+    def __init__(self, path, locations, dates, metrics):
+        self.path = path
+        self.locations = locations
+        self.dates = dates
+        self.metrics = metrics
+
+    @classmethod
+    def build(cls, frame, metrics, path, source=None):
+        """Pivots a long-format frame (date, location, metrics...) into the store at path."""
+        os.makedirs(path, exist_ok=True)
+        location_codes, locations = pd.factorize(frame['location'], sort=True)
+        start = frame['date'].min()
+        dates = pd.date_range(start, frame['date'].max(), freq='D')
+        day_index = ((frame['date'] - start) // pd.Timedelta(days=1)).to_numpy()
+
+        for metric in metrics:
+            matrix = np.lib.format.open_memmap(
+                os.path.join(path, f'{metric}.npy'), mode='w+',
+                dtype=np.float64, shape=(len(locations), len(dates)))
+            matrix[:] = np.nan
+            matrix[location_codes, day_index] = frame[metric].to_numpy(dtype=np.float64, na_value=np.nan)
+            matrix.flush()
+            del matrix
+
+        metadata = {
+            'source': source,
+            'locations': locations.tolist(),
+            'start': str(dates[0].date()),
+            'days': len(dates),
+            'metrics': list(metrics),
+            'fingerprint': atomic_frame_fingerprint(frame, ['location', 'date', *metrics]),
+        }
+        with open(os.path.join(path, 'metadata.json'), 'w', encoding='utf-8') as metadata_file:
+            json.dump(metadata, metadata_file)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path):
+        """Reopens a previously built store without touching the source data."""
+        with open(os.path.join(path, 'metadata.json'), 'r', encoding='utf-8') as metadata_file:
+            metadata = json.load(metadata_file)
+        dates = pd.date_range(metadata['start'], periods=metadata['days'], freq='D')
+        store = cls(path, metadata['locations'], dates, metadata['metrics'])
+        store.source = metadata['source']
+        store.fingerprint = metadata.get('fingerprint')
+        return store
+
+    @classmethod
+    def open_or_build(cls, frame, metrics, path, source=None):
+        """
+        Opens the store at path if it was built from the same source, metrics
+        and frame contents (by fingerprint); otherwise rebuilds it. This only
+        skips the pivot: the frame itself is still needed for the check. Use
+        open() to read an existing store without any frame at all.
+        """
+        try:
+            store = cls.open(path)
+            if (store.source == source
+                    and store.metrics == list(metrics)
+                    and store.fingerprint == atomic_frame_fingerprint(frame, ['location', 'date', *metrics])):
+                return store
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        return cls.build(frame, metrics, path, source=source)
+
+    def matrix(self, metric):
+        """Read-only (locations x days) view of a metric."""
+        return np.load(os.path.join(self.path, f'{metric}.npy'), mmap_mode='r')
+
+    def latest(self, metric):
+        """Last reported value of a metric for every location (NaN if never reported)."""
+        matrix = self.matrix(metric)
+        reported = ~np.isnan(matrix)
+        last_day = matrix.shape[1] - 1 - np.argmax(reported[:, ::-1], axis=1)
+        values = matrix[np.arange(matrix.shape[0]), last_day]
+        return pd.Series(np.where(reported.any(axis=1), values, np.nan), index=self.locations, name=metric)
+
+    def rank(self, metric, ascending=False):
+        """Ranks locations by their latest reported value of a metric."""
+        return self.latest(metric).sort_values(ascending=ascending)
+
+    def rolling_mean(self, metric, window=7):
+        """Trailing rolling mean along the date axis, skipping unreported days (min_periods=1)."""
+        matrix = self.matrix(metric)
+        reported = ~np.isnan(matrix)
+        padding = np.zeros((matrix.shape[0], 1))
+        totals = np.concatenate([padding, np.cumsum(np.where(reported, matrix, 0.0), axis=1)], axis=1)
+        counts = np.concatenate([padding, np.cumsum(reported, axis=1)], axis=1)
+        window_totals = totals[:, window:] - totals[:, :-window]
+        window_counts = counts[:, window:] - counts[:, :-window]
+        # The first window-1 days only see a partial window
+        window_totals = np.concatenate([totals[:, 1:window], window_totals], axis=1)
+        window_counts = np.concatenate([counts[:, 1:window], window_counts], axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(window_counts > 0, window_totals / window_counts, np.nan)
+
+    def to_frame(self, metric):
+        """Wide DataFrame view (dates x locations) of a metric."""
+        return pd.DataFrame(np.asarray(self.matrix(metric)).T, index=self.dates, columns=self.locations)
+
+
+def load_or_build_map_payload(frame, metric, as_of=None, cache_dir=ATOMIC_CACHE_DIR):
+    """
+    Returns the compact choropleth payload for a metric: the last reported
+    value per iso_code on or before as_of (default: latest), plus location
+    names for hover text. OWID aggregate codes (OWID_*) are not mappable and
+    are left out. The payload is cached on disk and reused only while the
+    content fingerprint of the columns it is built from (see
+    atomic_frame_fingerprint) and as_of are unchanged.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    selection = as_of or 'latest'
+    payload_path = os.path.join(cache_dir, f"map_payload_{metric}_{selection}.json")
+    fingerprint = f"{atomic_frame_fingerprint(frame, ['iso_code', 'location', 'date', metric])}|{as_of}"
+    try:
+        with open(payload_path, 'r', encoding='utf-8') as payload_file:
+            payload = json.load(payload_file)
+        if payload['fingerprint'] == fingerprint and payload['selection'] == selection:
+            return payload
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    reported = frame.loc[frame['iso_code'].notna() & frame[metric].notna(),
+                         ['iso_code', 'location', 'date', metric]]
+    reported = reported[~reported['iso_code'].str.startswith('OWID_')]
+    if as_of is not None:
+        reported = reported[reported['date'] <= pd.Timestamp(as_of)]
+    latest = reported.sort_values('date').drop_duplicates('iso_code', keep='last').sort_values('iso_code')
+    payload = {
+        'fingerprint': fingerprint,
+        'metric': metric,
+        'selection': selection,
+        'as_of': str(latest['date'].max().date()) if not latest.empty else None,
+        'values': dict(zip(latest['iso_code'], latest[metric].astype(float))),
+        'names': dict(zip(latest['iso_code'], latest['location'])),
+    }
+    with open(payload_path, 'w', encoding='utf-8') as payload_file:
+        json.dump(payload, payload_file)
+    return payload
+
+
+def export_atomic_choropleth(payload, title, label, cache_dir=ATOMIC_CACHE_DIR):
+    """
+    Exports the choropleth for a payload as self-contained HTML and figure
+    JSON. The figure is only rebuilt when the payload contents change;
+    otherwise the existing artifacts are reused. Artifacts are named by metric
+    and as_of selection, like the payload file. Returns the HTML path.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    base_path = os.path.join(cache_dir, f"map_{payload['metric']}_{payload['selection']}")
+    html_path, json_path, digest_path = base_path + '.html', base_path + '.json', base_path + '.sha1'
+    digest = hashlib.sha1(json.dumps(
+        [payload['values'], payload['names'], title, label], sort_keys=True).encode('utf-8')).hexdigest()
+    if os.path.exists(html_path) and os.path.exists(json_path) and os.path.exists(digest_path):
+        with open(digest_path, 'r', encoding='utf-8') as digest_file:
+            if digest_file.read() == digest:
+                return html_path
+
+    map_data = pd.DataFrame({
+        'iso_code': list(payload['values']),
+        'location': [payload['names'][code] for code in payload['values']],
+        payload['metric']: list(payload['values'].values()),
+    })
+    fig = px.choropleth(map_data,
+                        locations="iso_code",
+                        color=payload['metric'],
+                        hover_name="location",
+                        color_continuous_scale=px.colors.sequential.Plasma, # Atomic plasma color scale
+                        title=title,
+                        labels={payload['metric']: label},
+                        projection="natural earth")
+    fig.update_layout(
+        paper_bgcolor="#1a202c",  # Dark background
+        font_color="#e2e8f0",      # Light text color
+        title_font_color="#c3a6ff", # Atomic title color
+        geo_bgcolor="#2d3748"      # Darker map background
+    )
+    fig.write_html(html_path, include_plotlyjs=True)
+    fig.write_json(json_path)
+    with open(digest_path, 'w', encoding='utf-8') as digest_file:
+        digest_file.write(digest)
+    return html_path
+
 
 print("--- Initiating COVID-19 Global Data Tracker (Shadow Garden Edition) ---")
 print("Objective: Acquire, Process, Analyze, and Visualize Global Health Intelligence.")
@@ -20,7 +232,9 @@ covid_data_url = 'https://raw.githubusercontent.com/owid/covid-19-data/master/pu
 
 try:
     print(f"📡 Attempting to load global intel from '{covid_data_url}'...")
-    df = pd.read_csv(covid_data_url)
+    # The registry snapshots the feed (with 'date' already parsed) once per day;
+    # later runs that day open the memory-mapped snapshot instead of re-fetching.
+    df = load_atomic_dataset('csv', covid_data_url, parse_dates=['date'])
     print("✅ Global Intel Dataset Loaded Successfully. Data stream established. ✅")
 
     # Check columns
@@ -110,6 +324,15 @@ df_filtered['death_rate'] = df_filtered['death_rate'].fillna(0) # Handle divisio
 df_filtered['death_rate'] = df_filtered['death_rate'].replace([float('inf'), -float('inf')], 0) # Replace inf with 0
 print("✅ Mortal Coil Index computed. Vulnerability identified. ✅")
 
+# Align every location onto a common daily grid so cross-country comparisons,
+# rankings and rolling windows below are axis operations instead of regroupings.
+print("\n🧮 Aligning locations onto a common daily grid (Dense Intel Matrix)...")
+matrix_metrics = [col for col in ['total_cases', 'new_cases', 'total_deaths', 'new_deaths', 'death_rate']
+                  if col in df_filtered.columns]
+intel_matrix = AtomicLocationDateStore.open_or_build(
+    df_filtered, matrix_metrics, os.path.join(ATOMIC_CACHE_DIR, 'location_date_matrix'), source=covid_data_url)
+print(f"✅ Dense Intel Matrix ready: {len(intel_matrix.locations)} locations x {len(intel_matrix.dates)} days. ✅")
+
 # Compute basic statistics of numerical columns
 print("\n📊 Core Metrics Overview (df_filtered.describe()):")
 print(df_filtered.describe())
@@ -162,9 +385,11 @@ plt.show()
 # Compare daily new cases between countries (example for a specific period or overall)
 print("Generating Visualizations: Daily New Cases Comparison...")
 # Take a rolling average to smooth out daily fluctuations for better trend visualization
-df_filtered['new_cases_smoothed'] = df_filtered.groupby('location')['new_cases'].transform(lambda x: x.rolling(window=7, min_periods=1).mean())
+# (dates x locations, straight from the dense matrix)
+new_cases_smoothed = pd.DataFrame(intel_matrix.rolling_mean('new_cases', window=7).T,
+                                  index=intel_matrix.dates, columns=intel_matrix.locations)
 plt.figure(figsize=(14, 8))
-sns.lineplot(data=df_filtered, x='date', y='new_cases_smoothed', hue='location', palette='plasma', linewidth=2.5)
+sns.lineplot(data=new_cases_smoothed, palette='plasma', linewidth=2.5, dashes=False)
 plt.title('Daily New Cases (7-Day Smoothed) Over Time (Infection Sprawl Dynamics) 📊', fontsize=18, color='#c3a6ff')
 plt.xlabel('Date', fontsize=14)
 plt.ylabel('7-Day Avg New Cases', fontsize=14)
@@ -176,8 +401,7 @@ plt.show()
 
 # Bar chart: Top countries by total cases (latest date)
 print("Generating Visualizations: Top Countries by Total Cases (Latest Intel)...")
-latest_data = df_filtered.loc[df_filtered.groupby('location')['date'].idxmax()]
-latest_data_sorted = latest_data.sort_values('total_cases', ascending=False)
+latest_data_sorted = intel_matrix.rank('total_cases').rename_axis('location').reset_index()
 
 plt.figure(figsize=(12, 7))
 sns.barplot(x='location', y='total_cases', data=latest_data_sorted, palette='rocket')
@@ -201,6 +425,12 @@ plt.grid(axis='y', linestyle='--', alpha=0.7)
 plt.tight_layout()
 plt.show()
 
+# Cross-country rankings read straight off the dense matrix
+print("\n🏆 Location Ranking by Latest Death Rate (%):")
+print(intel_matrix.rank('death_rate').round(2).to_string())
+print("\n🏆 Peak 7-Day Avg New Cases by Location:")
+print(new_cases_smoothed.max().sort_values(ascending=False).round(0).to_string())
+
 print("-------------------------------------------------------------------")
 
 # --- 4️⃣ Visualizing Vaccination Progress ---
@@ -255,30 +485,20 @@ print("-------------------------------------------------------------------")
 # --- 5️⃣ Optional: Build a Choropleth Map ---
 print("\n[Phase 5: Global Tactical Mapping (Choropleth)]")
 
-# Prepare a dataframe with iso_code, total_cases for the latest date.
-# Filter for the latest date for each country for the map
-map_data = df.loc[df.groupby('iso_code')['date'].idxmax()]
-# Ensure we only include countries with 'total_cases' and 'iso_code'
-map_data = map_data.dropna(subset=['iso_code', 'total_cases'])
+# Map configuration: which metric to project and for which date (None = latest report)
+map_metric = 'total_cases'
+map_as_of = None
 
-if not map_data.empty:
-    print("Generating Global Contagion Map...")
-    fig = px.choropleth(map_data,
-                        locations="iso_code",
-                        color="total_cases",
-                        hover_name="location",
-                        color_continuous_scale=px.colors.sequential.Plasma, # Atomic plasma color scale
-                        title='Global Total COVID-19 Cases (Latest Tactical Overview) 🗺️',
-                        labels={'total_cases':'Total Cases'},
-                        projection="natural earth")
-    fig.update_layout(
-        paper_bgcolor="#1a202c",  # Dark background
-        font_color="#e2e8f0",      # Light text color
-        title_font_color="#c3a6ff", # Atomic title color
-        geo_bgcolor="#2d3748"      # Darker map background
-    )
-    fig.show()
-    print("✅ Global Contagion Map projected. Threat assessment refined. ✅")
+# Prepare a compact iso_code -> value payload (cached on disk between runs)
+map_payload = load_or_build_map_payload(df, map_metric, as_of=map_as_of)
+
+if map_payload['values']:
+    print(f"Generating Global Contagion Map ({len(map_payload['values'])} territories, as of {map_payload['as_of']})...")
+    map_label = map_metric.replace('_', ' ').title()
+    map_path = export_atomic_choropleth(map_payload,
+                                        title=f'Global {map_label} of COVID-19 (Tactical Overview, {map_payload["as_of"]}) 🗺️',
+                                        label=map_label)
+    print(f"✅ Global Contagion Map projected to '{map_path}'. Threat assessment refined. ✅")
 else:
     print("Warning: Not enough data to generate a Global Contagion Map.")
 
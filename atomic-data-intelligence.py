@@ -4,7 +4,202 @@
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.datasets import load_iris # A classic intel dataset for this operation
+from atomic_dataset_registry import load_atomic_dataset # Snapshot-backed dataset sources
+import heapq
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Columns per block: a 256 x 256 float64 tile is 512 KB, which sits comfortably in cache
+ATOMIC_BLOCK_SIZE = 256
+
+
+def standardize_atomic_columns(values):
+    """
+    Centres and scales each column once (ddof=1), ignoring missing values, so
+    that without gaps Z.T @ Z / (n - 1) is the correlation matrix. Constant
+    columns become all zeros; missing values stay NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.nan_to_num(np.nanmean(values, axis=0))
+        stds = np.nan_to_num(np.nanstd(values, axis=0, ddof=1))
+    stds[stds == 0] = np.inf
+    return (values - means) / stds
+
+
+def _atomic_block_pairs(column_count, block_size):
+    # Upper-triangular schedule of (row block, column block) tiles
+    starts = range(0, column_count, block_size)
+    return [(i, j) for i in starts for j in starts if j >= i]
+
+
+def _pairwise_moments(left, right):
+    """
+    Pairwise-complete moments of two column blocks that may contain NaN:
+    for every (a, b) column pair, the row count and sums over the rows where
+    both values are present. Returns (n, sum_a, sum_b, sum_aa, sum_bb, sum_ab).
+    """
+    left_present, right_present = ~np.isnan(left), ~np.isnan(right)
+    left_values, right_values = np.where(left_present, left, 0.0), np.where(right_present, right, 0.0)
+    left_present, right_present = left_present.astype(np.float64), right_present.astype(np.float64)
+    return (left_present.T @ right_present,
+            left_values.T @ right_present,
+            left_present.T @ right_values,
+            (left_values ** 2).T @ right_present,
+            left_present.T @ right_values ** 2,
+            left_values.T @ right_values)
+
+
+def _covariance_from_moments(n, sum_a, sum_b, sum_aa, sum_bb, sum_ab):
+    # Pairwise sample covariances and variances (ddof=1); NaN where fewer than two rows overlap
+    with np.errstate(invalid='ignore', divide='ignore'):
+        degrees = np.where(n > 1, n - 1, np.nan)
+        covariance = (sum_ab - sum_a * sum_b / n) / degrees
+        variance_a = (sum_aa - sum_a ** 2 / n) / degrees
+        variance_b = (sum_bb - sum_b ** 2 / n) / degrees
+    return covariance, variance_a, variance_b
+
+
+def _correlation_from_moments(moments):
+    covariance, variance_a, variance_b = _covariance_from_moments(*moments)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scale = np.sqrt(np.clip(variance_a, 0, None) * np.clip(variance_b, 0, None))
+        return np.where(scale > 0, covariance / scale, np.nan)
+
+
+def _top_pairs_in_block(block, i, j, top_k):
+    # Collects the top_k |r| entries of one tile, skipping the diagonal, lower triangle and NaN
+    if i == j:
+        rows, cols = np.triu_indices(block.shape[0], k=1)
+    else:
+        rows, cols = np.indices(block.shape).reshape(2, -1)
+    strengths = np.abs(block[rows, cols])
+    finite = np.isfinite(strengths)
+    rows, cols, strengths = rows[finite], cols[finite], strengths[finite]
+    if len(strengths) > top_k:
+        keep = np.argpartition(strengths, -top_k)[-top_k:]
+        rows, cols = rows[keep], cols[keep]
+    return [(abs(block[r, c]), i + r, j + c, block[r, c]) for r, c in zip(rows, cols)]
+
+
+def _merge_top_pairs(candidate_lists, columns, top_k):
+    best = heapq.nlargest(top_k, (pair for pairs in candidate_lists for pair in pairs))
+    return pd.DataFrame(
+        [(columns[a], columns[b], r) for _, a, b, r in best],
+        columns=['feature_a', 'feature_b', 'correlation'])
+
+
+def find_top_correlated_pairs(df, top_k=10, block_size=ATOMIC_BLOCK_SIZE, max_workers=None):
+    """
+    Returns the top_k most strongly correlated (by |r|) pairs of numeric
+    columns. Columns are standardized once, then the correlation matrix is
+    computed tile by tile across a thread pool (NumPy releases the GIL in
+    matrix products); each tile is reduced to its own top_k before the next
+    is produced, so the full dense matrix is never materialized. Missing
+    values are handled pairwise, like df.corr(): each pair uses the rows
+    where both columns are present.
+    """
+    numeric = df.select_dtypes(include='number')
+    columns = numeric.columns.tolist()
+    z = standardize_atomic_columns(numeric.to_numpy(dtype=np.float64, na_value=np.nan))
+    has_gaps = bool(np.isnan(z).any())
+    # Zero-variance columns standardize to all zeros; their correlations are undefined (NaN), as in df.corr()
+    zero_variance = ~np.nan_to_num(z).any(axis=0)
+    denominator = z.shape[0] - 1
+
+    def correlate_tile(tile):
+        i, j = tile
+        left, right = z[:, i:i + block_size], z[:, j:j + block_size]
+        if has_gaps:
+            block = _correlation_from_moments(_pairwise_moments(left, right))
+        else:
+            block = left.T @ right / denominator
+            block[zero_variance[i:i + block_size], :] = np.nan
+            block[:, zero_variance[j:j + block_size]] = np.nan
+        return _top_pairs_in_block(block, i, j, top_k)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        candidates = list(pool.map(correlate_tile, _atomic_block_pairs(len(columns), block_size)))
+    return _merge_top_pairs(candidates, columns, top_k)
+
+
+class AtomicStreamingCorrelation:
+    """
+    Accumulates covariance/correlation statistics over row chunks, for data
+    that does not fit in memory. Each chunk is shifted by the first chunk's
+    means for numerical stability, and its pairwise-complete moments (so
+    missing values only drop the affected pairs) are added tile by tile
+    across a thread pool.
+    """
+
+    def __init__(self, columns, block_size=ATOMIC_BLOCK_SIZE, max_workers=None):
+        self.columns = list(columns)
+        self.block_size = block_size
+        self.max_workers = max_workers
+        self.shift = None
+        width = len(self.columns)
+        # Pair counts and co-moments; sums/squares are per (column, partner) since gaps differ per pair
+        self.counts = np.zeros((width, width))
+        self.sums = np.zeros((width, width))
+        self.squares = np.zeros((width, width))
+        self.cross_products = np.zeros((width, width))
+
+    def update(self, chunk):
+        """Adds one chunk of rows (DataFrame or 2D array with the same columns)."""
+        if isinstance(chunk, pd.DataFrame):
+            chunk = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.asarray(chunk, dtype=np.float64)
+        if not len(values):
+            return self
+        if self.shift is None:
+            with np.errstate(invalid='ignore'):
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0))
+        values = values - self.shift
+        block_size = self.block_size
+
+        def accumulate_tile(tile):
+            # Tiles and their mirrored lower tiles are disjoint, so threads never write the same cells
+            i, j = tile
+            rows, cols = slice(i, i + block_size), slice(j, j + block_size)
+            n, sum_a, sum_b, sum_aa, sum_bb, sum_ab = _pairwise_moments(values[:, rows], values[:, cols])
+            self.counts[rows, cols] += n
+            self.cross_products[rows, cols] += sum_ab
+            self.sums[rows, cols] += sum_a
+            self.squares[rows, cols] += sum_aa
+            if i != j:
+                # Mirror the partner sums into the lower tile so every (column, partner) cell is kept
+                self.sums[cols, rows] += sum_b.T
+                self.squares[cols, rows] += sum_bb.T
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(accumulate_tile, _atomic_block_pairs(len(self.columns), block_size)))
+        return self
+
+    def _moments(self, rows=slice(None), cols=slice(None)):
+        # Pairwise moments for a (rows, cols) window of the upper triangle
+        return (self.counts[rows, cols], self.sums[rows, cols], self.sums[cols, rows].T,
+                self.squares[rows, cols], self.squares[cols, rows].T, self.cross_products[rows, cols])
+
+    def _symmetric(self, matrix):
+        return np.triu(matrix) + np.triu(matrix, k=1).T
+
+    def covariance(self):
+        """Pairwise-complete sample covariance matrix (ddof=1) of everything seen so far."""
+        return self._symmetric(_covariance_from_moments(*self._moments())[0])
+
+    def correlation(self):
+        """Pairwise-complete Pearson correlation matrix of everything seen so far."""
+        return self._symmetric(_correlation_from_moments(self._moments()))
+
+    def top_pairs(self, top_k=10):
+        """Top_k most strongly correlated column pairs, reduced tile by tile."""
+        block_size = self.block_size
+        candidates = []
+        for i, j in _atomic_block_pairs(len(self.columns), block_size):
+            rows, cols = slice(i, i + block_size), slice(j, j + block_size)
+            block = _correlation_from_moments(self._moments(rows, cols))
+            candidates.append(_top_pairs_in_block(block, i, j, top_k))
+        return _merge_top_pairs(candidates, self.columns, top_k)
 
 print("--- Initiating Shadow Garden Data Intelligence Protocol ---")
 print("Objective: Infiltrate, Analyze, and Visualize Data with Atomic Precision.")
@@ -14,25 +209,13 @@ print("---------------------------------------------------------------")
 print("\n[Phase 1: Data Infiltration and Reconnaissance]")
 
 # Choose a dataset in CSV format (using Iris dataset as per suggestion)
-# Using a try-except block to simulate file reading error handling,
-# although load_iris is built-in and won't throw FileNotFoundError.
-# This demonstrates the robust error handling required for file operations.
+# The dataset registry loads the sklearn built-in once, cleans the column headers
+# (e.g. 'sepal length (cm)' -> 'sepal_length'), maps the target to species names,
+# and stores a memory-mapped snapshot; later runs open that snapshot directly.
+# The try-except block keeps the robust error handling required for file operations.
 try:
     print("📡 Attempting to load Iris dataset (classified as 'Flower Metrics')...")
-    iris = load_iris()
-    # Convert to pandas DataFrame for easier manipulation
-    df = pd.DataFrame(data=iris.data, columns=iris.feature_names)
-
-    # --- ATOMIC FIX: Clean and rename column headers for direct access ---
-    # This line iterates through the column names, removes " (cm)" and replaces spaces with underscores.
-    df.columns = [col.replace(' (cm)', '').replace(' ', '_') for col in df.columns]
-
-    # Map numerical target to actual species names
-    species_map = {i: name for i, name in enumerate(iris.target_names)}
-    # --- ATOMIC FIX: Ensure correct species assignment for all rows ---
-    # Assign the numerical target first, then map to string names
-    df['species'] = iris.target
-    df['species'] = df['species'].map(species_map)
+    df = load_atomic_dataset('sklearn', 'iris', normalize_columns=True, target_column='species')
 
     print("✅ Iris Dataset Loaded Successfully. Intel secured. ✅")
 
@@ -86,6 +269,11 @@ numerical_cols = df.select_dtypes(include=['float64', 'int64']).columns
 grouped_means = df.groupby('species')[numerical_cols].mean()
 print(grouped_means)
 
+# Compute the strongest feature correlations with the blocked correlation stage.
+print("\n🧬 Strongest Inter-Component Correlations (Blocked Correlation Stage):")
+top_correlations = find_top_correlated_pairs(df, top_k=5)
+print(top_correlations.round(3).to_string(index=False))
+
 # Identify any patterns or interesting findings from your analysis.
 print("\n🔭 Strategic Findings from Analysis:")
 print("- **Iris Setosa (🌌Stealth-Type🌌):** Appears to have significantly smaller petal lengths and widths compared to others, indicating a distinct operational profile.")
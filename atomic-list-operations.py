@@ -4,6 +4,327 @@ print("--- Initiating Shadow Garden Atomic Data Sequence ---")
 print("This module performs critical array manipulations for intelligence processing.")
 print("------------------------------------------------------")
 
+import sys
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+from itertools import chain, islice
+
+# Tactical chunk size for the sorted sequence: small enough that array.insert
+# stays cheap, large enough that the chunk index stays tiny.
+ATOMIC_CHUNK_LOAD = 1000
+
+# Bulk extends sort incoming values in runs of this many chunks, so the only
+# temporary Python list ever built is one run long.
+ATOMIC_RUN_CHUNKS = 64
+
+
+class AtomicSortedSequence:
+    """
+    A sorted sequence of 64-bit integers stored as chunked array('q') blocks.
+    Each chunk stays sorted and is at most 2 * load elements long, so insert,
+    locate and remove only touch one small block after an O(log n) bisect
+    over the chunk maxima. Values cost 8 bytes each instead of a full Python
+    int object plus list pointer.
+    """
+
+    def __init__(self, values=(), load=ATOMIC_CHUNK_LOAD):
+        self._load = load
+        self._chunks = []   # Sorted array('q') blocks
+        self._maxes = []    # Largest value of each chunk, for bisect
+        self._offsets = []  # Starting position of each chunk (rebuilt lazily)
+        self._offsets_dirty = True
+        self._length = 0
+        self.extend(values)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __contains__(self, value):
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            return False
+        chunk = self._chunks[position]
+        index = bisect_left(chunk, value)
+        return chunk[index] == value
+
+    def __getitem__(self, index):
+        chunk_position, local_index = self._locate_position(index)
+        return self._chunks[chunk_position][local_index]
+
+    def __repr__(self):
+        return f"AtomicSortedSequence({list(self)})"
+
+    @property
+    def nbytes(self):
+        """Bytes held by the value blocks (excluding the small chunk index)."""
+        return sum(chunk.itemsize * len(chunk) for chunk in self._chunks)
+
+    def add(self, value):
+        """Inserts a value at its sorted position."""
+        if not self._chunks:
+            self._chunks.append(array('q', [value]))
+            self._maxes.append(value)
+        else:
+            position = bisect_right(self._maxes, value)
+            if position == len(self._maxes):
+                # Beyond every known value: append to the last chunk
+                position -= 1
+                self._chunks[position].append(value)
+                self._maxes[position] = value
+            else:
+                insort(self._chunks[position], value)
+            self._split_chunk(position)
+        self._length += 1
+        self._offsets_dirty = True
+
+    def extend(self, values):
+        """
+        Adds many values at once. Small batches are inserted one by one;
+        large batches are sorted in bounded runs and streamed through a k-way
+        merge with the existing chunks straight into new array blocks.
+        """
+        incoming = array('q', values)
+        if len(incoming) < self._load:
+            for value in incoming:
+                self.add(value)
+            return
+        run_length = self._load * ATOMIC_RUN_CHUNKS
+        runs = [array('q', sorted(incoming[start:start + run_length]))
+                for start in range(0, len(incoming), run_length)]
+        del incoming
+        length = len(self) + sum(map(len, runs))
+        runs = self._chunks + runs
+        if all(previous[-1] <= following[0] for previous, following in zip(runs, runs[1:])):
+            # Runs do not overlap (e.g. already-sorted input): plain concatenation is enough
+            self._rebuild(chain.from_iterable(runs), length)
+        else:
+            self._rebuild(merge(chain.from_iterable(self._chunks), *runs[len(self._chunks):]), length)
+
+    def remove(self, value):
+        """Removes one occurrence of value, raising ValueError if absent."""
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            raise ValueError(f"{value} is not in sequence")
+        chunk = self._chunks[position]
+        index = bisect_left(chunk, value)
+        if chunk[index] != value:
+            raise ValueError(f"{value} is not in sequence")
+        self._delete(position, index)
+
+    def pop(self, index=-1):
+        """Removes and returns the value at index (default: the largest)."""
+        if not self._length:
+            raise IndexError("pop from empty sequence")
+        chunk_position, local_index = self._locate_position(index)
+        value = self._chunks[chunk_position][local_index]
+        self._delete(chunk_position, local_index)
+        return value
+
+    def index(self, value):
+        """Returns the position of the first occurrence of value."""
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            raise ValueError(f"{value} is not in sequence")
+        chunk = self._chunks[position]
+        local_index = bisect_left(chunk, value)
+        if chunk[local_index] != value:
+            raise ValueError(f"{value} is not in sequence")
+        return self._chunk_offsets()[position] + local_index
+
+    def _rebuild(self, merged, length):
+        # Consumes a sorted stream of exactly length values into fresh chunks
+        load = self._load
+        chunks = [array('q', islice(merged, load)) for _ in range(0, length, load)]
+        self._chunks = chunks
+        self._maxes = [chunk[-1] for chunk in chunks]
+        self._length = length
+        self._offsets_dirty = True
+
+    def _split_chunk(self, position):
+        chunk = self._chunks[position]
+        if len(chunk) > 2 * self._load:
+            half = len(chunk) // 2
+            self._chunks[position:position + 1] = [chunk[:half], chunk[half:]]
+            self._maxes[position:position + 1] = [chunk[half - 1], chunk[-1]]
+
+    def _delete(self, position, local_index):
+        chunk = self._chunks[position]
+        del chunk[local_index]
+        if chunk:
+            self._maxes[position] = chunk[-1]
+        else:
+            del self._chunks[position]
+            del self._maxes[position]
+        self._length -= 1
+        self._offsets_dirty = True
+
+    def _chunk_offsets(self):
+        if self._offsets_dirty:
+            offsets = []
+            total = 0
+            for chunk in self._chunks:
+                offsets.append(total)
+                total += len(chunk)
+            self._offsets = offsets
+            self._offsets_dirty = False
+        return self._offsets
+
+    def _locate_position(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("sequence index out of range")
+        offsets = self._chunk_offsets()
+        chunk_position = bisect_right(offsets, index) - 1
+        return chunk_position, index - offsets[chunk_position]
+
+
+class AtomicOperationLog:
+    """
+    Records list operations (append, insert, extend, pop, remove, sort, index)
+    so they can be replayed in bulk. Appends and extends pile up in a tail
+    buffer that lands in the data with a single extend; pops, inserts,
+    removes and locates that fall inside that tail are served from the buffer
+    so they cancel out before touching the data; a sort merges the buffer in
+    one pass, and sorts that would find the data already in order are skipped.
+    Every result and the final list match a naive one-by-one replay.
+    """
+
+    def __init__(self):
+        self.operations = []
+        self.stats = {'extends': 0, 'sorts': 0, 'skipped_sorts': 0}
+
+    def append(self, value):
+        self.operations.append(('append', value))
+        return self
+
+    def insert(self, index, value):
+        self.operations.append(('insert', index, value))
+        return self
+
+    def extend(self, values):
+        # Snapshot the values now so iterators replay identically later
+        self.operations.append(('extend', list(values)))
+        return self
+
+    def pop(self, index=-1):
+        self.operations.append(('pop', index))
+        return self
+
+    def remove(self, value):
+        self.operations.append(('remove', value))
+        return self
+
+    def sort(self, key=None, reverse=False):
+        self.operations.append(('sort', key, reverse))
+        return self
+
+    def index(self, value):
+        self.operations.append(('index', value))
+        return self
+
+    def replay(self, data):
+        """
+        Naive reference replay: applies each operation to data in order.
+        Returns the results of the pop and index operations.
+        """
+        results = []
+        for operation in self.operations:
+            name = operation[0]
+            if name == 'append':
+                data.append(operation[1])
+            elif name == 'insert':
+                data.insert(operation[1], operation[2])
+            elif name == 'extend':
+                data.extend(operation[1])
+            elif name == 'pop':
+                results.append(data.pop(operation[1]))
+            elif name == 'remove':
+                data.remove(operation[1])
+            elif name == 'sort':
+                data.sort(key=operation[1], reverse=operation[2])
+            elif name == 'index':
+                results.append(data.index(operation[1]))
+        return results
+
+    def execute(self, data):
+        """
+        Batched replay: applies the logged operations to data with as few
+        reallocations and sorts as possible. Returns the same results as
+        replay() and leaves data in the same final state, even if an
+        operation raises part-way through.
+        """
+        results = []
+        tail = []           # Pending appends, logically positioned after data
+        sorted_as = None    # (reverse,) the data is known to be sorted by, if any
+        self.stats = {'extends': 0, 'sorts': 0, 'skipped_sorts': 0}
+        try:
+            for operation in self.operations:
+                name = operation[0]
+                if name == 'append':
+                    tail.append(operation[1])
+                elif name == 'extend':
+                    tail.extend(operation[1])
+                elif name == 'insert':
+                    index = operation[1]
+                    total = len(data) + len(tail)
+                    if index < 0:
+                        index = max(index + total, 0)
+                    if index <= len(data) and not (tail and index == len(data)):
+                        data.insert(index, operation[2])
+                        sorted_as = None
+                    else:
+                        tail.insert(index - len(data), operation[2])
+                elif name == 'pop':
+                    index = operation[1]
+                    total = len(data) + len(tail)
+                    if not total:
+                        raise IndexError("pop from empty list")
+                    if index < 0:
+                        index += total
+                    if not 0 <= index < total:
+                        raise IndexError("pop index out of range")
+                    if index >= len(data):
+                        results.append(tail.pop(index - len(data)))
+                    else:
+                        # Removing an element never breaks sorted order
+                        results.append(data.pop(index))
+                elif name == 'remove':
+                    try:
+                        data.remove(operation[1])
+                    except ValueError:
+                        tail.remove(operation[1])
+                elif name == 'index':
+                    try:
+                        results.append(data.index(operation[1]))
+                    except ValueError:
+                        results.append(len(data) + tail.index(operation[1]))
+                elif name == 'sort':
+                    key, reverse = operation[1], operation[2]
+                    if not tail and key is None and sorted_as == (reverse,):
+                        self.stats['skipped_sorts'] += 1
+                        continue
+                    if tail:
+                        data.extend(tail)
+                        tail.clear()
+                        self.stats['extends'] += 1
+                    data.sort(key=key, reverse=reverse)
+                    self.stats['sorts'] += 1
+                    sorted_as = (reverse,) if key is None else None
+        finally:
+            if tail:
+                data.extend(tail)
+                self.stats['extends'] += 1
+        return results
+
+
 def execute_atomic_list_sequence():
     """
     Executes a sequence of list manipulations as a core atomic data operation.
@@ -46,7 +367,138 @@ def execute_atomic_list_sequence():
         print("7. Critical Datum (30) not found. Anomaly detected!")
     print("--- Atomic Data Sequence Protocol Complete ---")
 
+def execute_sorted_sequence_protocol():
+    """
+    Runs the same data sequence against the AtomicSortedSequence container.
+    Values always land in sorted position, so the insert and sort steps
+    collapse into plain adds and the locate step is a bisect.
+    """
+    print("\n--- Atomic Sorted Sequence Protocol ---")
+    sequence = AtomicSortedSequence()
+    for value in (10, 20, 30, 40):
+        sequence.add(value)
+    print(f"1. Appending Core Data Elements: {list(sequence)}")
+
+    sequence.add(15)
+    print(f"2. Slotting Priority Intel (15): {list(sequence)}")
+
+    sequence.extend([50, 60, 70])
+    print(f"3. Extending Array with Auxiliary Data: {list(sequence)}")
+
+    removed_element = sequence.pop()
+    print(f"4. Removing Largest Redundant Datum ({removed_element}): {list(sequence)}")
+
+    try:
+        index_of_30 = sequence.index(30)
+        print(f"5. Locating Critical Datum (30): Found at Tactical Index {index_of_30}")
+    except ValueError:
+        print("5. Critical Datum (30) not found. Anomaly detected!")
+    print("--- Atomic Sorted Sequence Protocol Complete ---")
+
+def execute_batched_list_sequence():
+    """
+    Records the atomic data sequence in an AtomicOperationLog, executes it in
+    bulk, and confirms the outcome matches a naive one-by-one replay.
+    """
+    print("\n--- Batched Atomic Data Sequence Protocol ---")
+    operation_log = AtomicOperationLog()
+    operation_log.append(10).append(20).append(30).append(40)
+    operation_log.insert(1, 15)
+    operation_log.extend([50, 60, 70])
+    operation_log.pop()
+    operation_log.sort()
+    operation_log.index(30)
+    print(f"1. Recorded {len(operation_log.operations)} operations in the tactical log.")
+
+    batched_list = []
+    batched_results = operation_log.execute(batched_list)
+    print(f"2. Batched Execution Result: {batched_list} | Outputs: {batched_results}")
+    print(f"   Bulk extends: {operation_log.stats['extends']} | Sorts: {operation_log.stats['sorts']}")
+
+    naive_list = []
+    naive_results = operation_log.replay(naive_list)
+    if naive_list == batched_list and naive_results == batched_results:
+        print("3. Naive replay matches batched execution. Integrity confirmed. ✅")
+    else:
+        print(f"3. Naive replay diverged: {naive_list} | Outputs: {naive_results}. Anomaly detected!")
+    print("--- Batched Atomic Data Sequence Protocol Complete ---")
+
+def traced_build_peak(build):
+    """Returns the peak bytes traced while build() runs, including its result."""
+    tracemalloc.start()
+    try:
+        build()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_atomic_sequences(sizes=(1_000_000, 10_000_000, 100_000_000), probes=100):
+    """
+    Compares the plain list sequence with AtomicSortedSequence at each size:
+    bulk build, a batch of sorted inserts, a batch of locates, memory held at
+    rest, and peak memory traced while building. Memory at rest for the list
+    counts the pointer array plus each distinct int object. The peak is taken
+    in a separate traced build so tracing does not skew the timings.
+    """
+    print("\n--- Atomic Sequence Benchmark Protocol ---")
+    for size in sizes:
+        # Spread values out so they are real int objects, not small-int singletons
+        values = range(0, size * 7, 7)
+        probe_values = range(3, probes * 7919, 7919)
+
+        start = time.perf_counter()
+        baseline = list(values)
+        baseline.sort()
+        build_list = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for value in probe_values:
+            insort(baseline, value)
+        insert_list = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for value in probe_values:
+            baseline.index(value)
+        locate_list = time.perf_counter() - start
+        list_bytes = sys.getsizeof(baseline) + sum(sys.getsizeof(value) for value in baseline)
+        del baseline
+        list_peak = traced_build_peak(lambda: sorted(values))
+
+        start = time.perf_counter()
+        sequence = AtomicSortedSequence(values)
+        build_sequence = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for value in probe_values:
+            sequence.add(value)
+        insert_sequence = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for value in probe_values:
+            sequence.index(value)
+        locate_sequence = time.perf_counter() - start
+        sequence_bytes = sequence.nbytes
+        del sequence
+        sequence_peak = traced_build_peak(lambda: AtomicSortedSequence(values))
+
+        print(f"\n📊 {size:,} elements ({probes:,} probes):")
+        print(f"   build : list {build_list:8.3f}s | sorted sequence {build_sequence:8.3f}s")
+        print(f"   insert: list {insert_list:8.3f}s | sorted sequence {insert_sequence:8.3f}s")
+        print(f"   locate: list {locate_list:8.3f}s | sorted sequence {locate_sequence:8.3f}s")
+        print(f"   memory: list {list_bytes / 1e6:8.1f}MB | sorted sequence {sequence_bytes / 1e6:8.1f}MB")
+        print(f"   peak  : list {list_peak / 1e6:8.1f}MB | sorted sequence {sequence_peak / 1e6:8.1f}MB")
+    print("--- Atomic Sequence Benchmark Protocol Complete ---")
+
 # Execute the list sequence when this script is run directly
 if __name__ == "__main__":
     execute_atomic_list_sequence()
+    execute_sorted_sequence_protocol()
+    execute_batched_list_sequence()
+    # Run the benchmark with: python atomic-list-operations.py --benchmark [size ...]
+    if "--benchmark" in sys.argv:
+        requested_sizes = [int(arg) for arg in sys.argv[sys.argv.index("--benchmark") + 1:]]
+        if requested_sizes:
+            benchmark_atomic_sequences(requested_sizes)
+        else:
+            benchmark_atomic_sequences()
     print("\nShadow Garden Data Operations Concluded. Prepare for next command. 🌙")
@@ -0,0 +1,255 @@
+# atomic_dataset_registry.py - Shadow Garden Dataset Source Registry
+
+# Importing necessary modules for our mission
+import os
+import re
+import json
+import shutil
+import hashlib
+import datetime
+import numpy as np
+import pandas as pd
+
+# Snapshots live alongside the other precomputed intel artifacts
+ATOMIC_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'atomic_intel_cache', 'snapshots')
+
+# Registry of dataset source kinds: kind -> source class
+DATASET_SOURCES = {}
+
+
+def register_dataset_source(kind):
+    """Class decorator that registers a dataset source under a kind name."""
+    def register(source_class):
+        DATASET_SOURCES[kind] = source_class
+        return source_class
+    return register
+
+
+def normalize_atomic_columns(columns):
+    """
+    Cleans column headers for direct access: drops unit suffixes such as
+    " (cm)", trims whitespace and replaces spaces with underscores. Raises
+    ValueError if two headers collapse onto the same name (e.g. "x (cm)"
+    and "x (mm)"), since the snapshot needs unique column names.
+    """
+    normalized = [re.sub(r'\s*\([^)]*\)\s*$', '', str(col)).strip().replace(' ', '_') for col in columns]
+    collisions = pd.Index(normalized)[pd.Index(normalized).duplicated()].unique().tolist()
+    if collisions:
+        originals = [str(col) for col, name in zip(columns, normalized) if name in collisions]
+        raise ValueError(f"Column headers {originals} normalize to duplicate names {collisions}; "
+                         "load without normalize_columns or rename them first.")
+    return normalized
+
+
+@register_dataset_source('sklearn')
+class SklearnDatasetSource:
+    """
+    Built-in scikit-learn dataset, e.g. location='iris' for load_iris().
+    The numeric target is mapped to its class names in target_column.
+    scikit-learn is only imported when a snapshot has to be (re)built.
+    """
+
+    def __init__(self, location, target_column='target'):
+        self.location = location
+        self.target_column = target_column
+
+    def version(self):
+        from importlib.metadata import version
+        return version('scikit-learn')
+
+    def load(self):
+        from sklearn import datasets
+        bunch = getattr(datasets, f'load_{self.location}')()
+        frame = pd.DataFrame(data=bunch.data, columns=bunch.feature_names)
+        target_names = getattr(bunch, 'target_names', None)
+        if target_names is not None:
+            frame[self.target_column] = pd.Series(bunch.target).map(dict(enumerate(target_names)))
+        else:
+            frame[self.target_column] = bunch.target
+        return frame
+
+
+@register_dataset_source('csv')
+class CsvDatasetSource:
+    """
+    CSV file or URL. Local files are versioned by size and modification
+    time; URLs are versioned by calendar day, so a remote feed is fetched
+    at most once per day.
+    """
+
+    def __init__(self, location, parse_dates=None):
+        self.location = location
+        self.parse_dates = parse_dates
+
+    def version(self):
+        if re.match(r'^[a-z]+://', self.location):
+            return datetime.date.today().isoformat()
+        stat = os.stat(self.location)
+        return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+    def load(self):
+        return pd.read_csv(self.location, parse_dates=self.parse_dates)
+
+
+@register_dataset_source('parquet')
+class ParquetDatasetSource:
+    """Local Parquet file, versioned by size and modification time."""
+
+    def __init__(self, location):
+        self.location = location
+
+    def version(self):
+        stat = os.stat(self.location)
+        return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+    def load(self):
+        return pd.read_parquet(self.location)
+
+
+def _snapshot_column(series):
+    """
+    Converts a column to plain NumPy arrays plus the metadata needed to
+    restore it exactly. Returns (values, column_meta, mask), where mask is
+    only set for pandas' masked nullable dtypes (Int64, Float64, ...).
+    Numeric, datetime (including its unit and timezone) and boolean columns
+    come back with their dtype; object columns must hold only strings (or
+    only booleans) and missing values. Mixed-type columns such as
+    [1, 'a', 2.5] and other dtypes with no exact encoding are rejected with
+    a ValueError rather than silently converted.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        timezone = getattr(series.dt, 'tz', None)
+        if timezone is not None:
+            # Stored as naive UTC instants; the zone is reapplied on open
+            series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+        return series.to_numpy(), {'kind': 'datetime', 'tz': None if timezone is None else str(timezone)}, None
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred == 'boolean':
+        if pd.api.types.is_bool_dtype(series.dtype) and not series.isna().any():
+            return series.to_numpy(dtype=bool), {'kind': 'plain'}, None
+        # Nullable booleans: int8 codes (-1 = missing, 0 = False, 1 = True)
+        codes = np.where(series.isna(), -1, series.fillna(False).astype(bool)).astype(np.int8)
+        return codes, {'kind': 'boolean', 'nullable': pd.api.types.is_extension_array_dtype(series)}, None
+    if pd.api.types.is_numeric_dtype(series):
+        if isinstance(series.array, (pd.arrays.IntegerArray, pd.arrays.FloatingArray)):
+            # Masked nullable numbers keep their exact values, mask and dtype
+            values = series.array
+            return values.to_numpy(dtype=values.dtype.numpy_dtype, na_value=0), \
+                {'kind': 'masked', 'dtype': str(values.dtype)}, values.isna()
+        if pd.api.types.is_extension_array_dtype(series):
+            raise ValueError(f"Column '{series.name}' has dtype {series.dtype}, which snapshots cannot "
+                             "store exactly; convert it to a NumPy or nullable pandas dtype first.")
+        return series.to_numpy(), {'kind': 'plain'}, None
+    if inferred not in ('string', 'empty'):
+        raise ValueError(f"Column '{series.name}' holds {inferred} values, which snapshots cannot "
+                         "store exactly; clean it to strings, numbers or datetimes first.")
+    # Text: int32 codes into a list of categories (-1 = missing)
+    codes, categories = pd.factorize(series)
+    return codes.astype(np.int32), {'kind': 'text', 'categories': categories.tolist()}, None
+
+
+def write_atomic_snapshot(frame, path, source_key=None):
+    """
+    Writes a frame as a snapshot directory: one .npy file per column plus
+    metadata.json. The directory is assembled next to path and moved into
+    place at the end, so readers never see a half-written snapshot.
+    source_key (the un-versioned source identity) is recorded so older
+    versions of the same source can be found and pruned.
+    """
+    duplicates = frame.columns[frame.columns.duplicated()].unique().tolist()
+    if duplicates:
+        raise ValueError(f"Cannot snapshot a frame with duplicate column names: {duplicates}")
+    staging_path = f'{path}.tmp-{os.getpid()}'
+    shutil.rmtree(staging_path, ignore_errors=True)
+    os.makedirs(staging_path)
+    columns = []
+    for position, name in enumerate(frame.columns):
+        values, column_meta, mask = _snapshot_column(frame[name])
+        np.save(os.path.join(staging_path, f'col_{position}.npy'), values)
+        if mask is not None:
+            np.save(os.path.join(staging_path, f'col_{position}_mask.npy'), mask)
+        columns.append(dict(column_meta, name=name))
+    with open(os.path.join(staging_path, 'metadata.json'), 'w', encoding='utf-8') as metadata_file:
+        json.dump({'columns': columns, 'rows': len(frame), 'source_key': source_key}, metadata_file)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(staging_path, path)
+
+
+def open_atomic_snapshot(path):
+    """
+    Opens a snapshot directory as a DataFrame. Numeric, boolean and datetime
+    columns are copy-on-write memory maps of the .npy files, so opening is
+    zero-copy and in-place edits never touch the snapshot on disk. Masked
+    nullable numbers wrap their value and mask maps; text, nullable boolean
+    and timezone-aware datetime columns are rebuilt with their original dtype.
+    """
+    with open(os.path.join(path, 'metadata.json'), 'r', encoding='utf-8') as metadata_file:
+        metadata = json.load(metadata_file)
+    data = {}
+    for position, column_meta in enumerate(metadata['columns']):
+        values = np.load(os.path.join(path, f'col_{position}.npy'), mmap_mode='c')
+        if column_meta['kind'] == 'text':
+            categories = np.array(column_meta['categories'] + [np.nan], dtype=object)
+            values = categories[values]  # Code -1 picks the trailing NaN
+        elif column_meta['kind'] == 'boolean':
+            if column_meta['nullable']:
+                values = pd.arrays.BooleanArray(values == 1, values == -1)
+            else:
+                # Same object column read_csv produces: True, False and NaN
+                values = np.array([False, True, np.nan], dtype=object)[values]
+        elif column_meta['kind'] == 'masked':
+            mask = np.load(os.path.join(path, f'col_{position}_mask.npy'), mmap_mode='c')
+            values = pd.api.types.pandas_dtype(column_meta['dtype']).construct_array_type()(values, mask)
+        elif column_meta['kind'] == 'datetime' and column_meta['tz'] is not None:
+            values = pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(column_meta['tz']).array
+        data[column_meta['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def prune_atomic_snapshots(cache_dir, source_key, keep_path):
+    """Removes every snapshot in cache_dir for source_key except the one at keep_path."""
+    for entry in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, entry)
+        if path == keep_path:
+            continue
+        try:
+            with open(os.path.join(path, 'metadata.json'), 'r', encoding='utf-8') as metadata_file:
+                if json.load(metadata_file).get('source_key') != source_key:
+                    continue
+        except (OSError, ValueError):
+            continue  # Not a finished snapshot (e.g. another writer's staging directory)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def load_atomic_dataset(kind, location, version=None, cache_dir=ATOMIC_SNAPSHOT_DIR,
+                        normalize_columns=False, **options):
+    """
+    Loads a dataset through the registry. The first load fetches it from the
+    source, optionally normalizes the column headers (normalize_columns=True,
+    see normalize_atomic_columns) and stores a snapshot keyed by kind,
+    location, options and version; later loads with the same key open the
+    snapshot directly. Pass version to pin a snapshot instead of using the
+    source's own version. Writing a new version prunes the older snapshots
+    of the same source, so a daily-versioned feed keeps only one copy.
+    """
+    if kind not in DATASET_SOURCES:
+        raise ValueError(f"Unknown dataset source '{kind}'. Registered sources: {sorted(DATASET_SOURCES)}")
+    source = DATASET_SOURCES[kind](location, **options)
+    if version is None:
+        version = source.version()
+    source_key = json.dumps([kind, location, sorted(options.items()), normalize_columns], default=str)
+    key = json.dumps([source_key, version])
+    snapshot_path = os.path.join(cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest()[:16])
+
+    if os.path.exists(os.path.join(snapshot_path, 'metadata.json')):
+        return open_atomic_snapshot(snapshot_path)
+
+    frame = source.load()
+    if normalize_columns:
+        frame.columns = normalize_atomic_columns(frame.columns)
+    os.makedirs(cache_dir, exist_ok=True)
+    write_atomic_snapshot(frame, snapshot_path, source_key=source_key)
+    prune_atomic_snapshots(cache_dir, source_key, snapshot_path)
+    return open_atomic_snapshot(snapshot_path)